@@ -1,24 +1,102 @@
 """
 Song model representing a music track with all necessary metadata
 """
-import uuid
+import itertools
+import sys
+import threading
+import time
 from datetime import datetime
 
+# Process-wide source of song IDs; ints hash in O(1) unlike uuid strings
+_ID_COUNTER = itertools.count(1)
+# Guards drawing from _ID_COUNTER and swapping it out in _reserve_id
+_ID_LOCK = threading.Lock()
+
+def _next_id():
+    """Allocate the next song ID"""
+    with _ID_LOCK:
+        return next(_ID_COUNTER)
+
+def _reserve_id(song_id):
+    """Move the ID counter past a restored int ID so new songs never reuse it"""
+    global _ID_COUNTER
+    with _ID_LOCK:
+        next_id = next(_ID_COUNTER)  # count() cannot be peeked; restart from here
+        _ID_COUNTER = itertools.count(max(next_id, song_id + 1))
+
 class Song:
     """
     Song model with metadata for playlist management
     Time Complexity: O(1) for initialization
     Space Complexity: O(1)
     """
-    def __init__(self, title, artist, duration, rating=0):
-        self.id = str(uuid.uuid4())
+    __slots__ = ('id', 'title', 'artist', 'duration', '_rating', '_play_count',
+                 '_title_lc', '_artist_lc',
+                 '_added_at_ts', '_added_at', '_added_at_iso', '_duration_fmt',
+                 '_dict_cache')  # to_dict() result; reset when a serialized field changes
+    
+    def __init__(self, title, artist, duration, rating=0, song_id=None):
+        self.id = _next_id() if song_id is None else song_id
         self.title = title
         self.artist = artist
+        self._title_lc = title.lower()  # for lookups and case-insensitive sorting
+        self._artist_lc = sys.intern(artist.lower())  # interned: blocklist compares by identity
         self.duration = duration  # in seconds
+        minutes, seconds = divmod(duration, 60)
+        self._duration_fmt = f"{minutes:02d}:{seconds:02d}"
         self.rating = rating  # 1-5 stars, 0 for unrated
-        self.added_at = datetime.now()
+        self._added_at_ts = time.time()  # epoch seconds; datetime built lazily
+        self._added_at = None
+        self._added_at_iso = None
         self.play_count = 0
-        
+    
+    @property
+    def rating(self):
+        """1-5 stars, 0 for unrated"""
+        return self._rating
+    
+    @rating.setter
+    def rating(self, value):
+        self._rating = value
+        self._dict_cache = None
+    
+    @property
+    def play_count(self):
+        """Number of times the song has been played"""
+        return self._play_count
+    
+    @play_count.setter
+    def play_count(self, value):
+        self._play_count = value
+        self._dict_cache = None
+    
+    @property
+    def added_at(self):
+        """Time the song was added, as a datetime"""
+        if self._added_at is None:
+            self._added_at = datetime.fromtimestamp(self._added_at_ts)
+        return self._added_at
+    
+    @added_at.setter
+    def added_at(self, value):
+        self._added_at_ts = value.timestamp()
+        self._added_at = value
+        self._added_at_iso = None
+        self._dict_cache = None
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a song from to_dict() output, keeping its original ID"""
+        song_id = data['id']
+        if isinstance(song_id, int):
+            _reserve_id(song_id)
+        song = cls(data['title'], data['artist'], data['duration'],
+                   data.get('rating', 0), song_id=song_id)
+        song.play_count = data.get('play_count', 0)
+        if data.get('added_at'):
+            song.added_at = datetime.fromisoformat(data['added_at'])
+        return song
+    
     def __str__(self):
         return f"{self.title} by {self.artist} ({self.duration}s)"
     
@@ -26,19 +104,25 @@ class Song:
         return f"Song('{self.title}', '{self.artist}', {self.duration}, {self.rating})"
     
     def to_dict(self):
-        """Convert song to dictionary for JSON serialization"""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'artist': self.artist,
-            'duration': self.duration,
-            'rating': self.rating,
-            'added_at': self.added_at.isoformat(),
-            'play_count': self.play_count
-        }
+        """Convert song to dictionary for JSON serialization (memoized; do not mutate)"""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'id': self.id,
+                'title': self.title,
+                'artist': self.artist,
+                'duration': self.duration,
+                'rating': self.rating,
+                'added_at': self._added_at_isoformat(),
+                'play_count': self.play_count
+            }
+        return self._dict_cache
+    
+    def _added_at_isoformat(self):
+        """ISO 8601 string for added_at, memoized after first use"""
+        if self._added_at_iso is None:
+            self._added_at_iso = self.added_at.isoformat()
+        return self._added_at_iso
     
     def get_duration_formatted(self):
-        """Return duration in MM:SS format"""
-        minutes = self.duration // 60
-        seconds = self.duration % 60
-        return f"{minutes:02d}:{seconds:02d}"
+        """Return duration in MM:SS format (precomputed at construction)"""
+        return self._duration_fmt
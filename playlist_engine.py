@@ -3,168 +3,232 @@ Main Playlist Engine combining all DSA implementations
 Demonstrates real-world application of data structures
 """
 
-from data_structures import (
-    HashSet, MinHeap, MaxHeap, DoublyLinkedList, 
-    Stack, BinarySearchTree, HashMap
-)
+from data_structures import RatingIndex
 from models import Song
+from collections import Counter, deque
+from functools import wraps
+from itertools import islice
+from operator import attrgetter
+import heapq
+import sys
+import threading
 import time
 
+# Sort key functions for sort_playlist, built once at import
+SORT_KEYS = {
+    'title': attrgetter('_title_lc'),
+    'artist': attrgetter('_artist_lc'),
+    'duration': attrgetter('duration'),
+    'rating': attrgetter('rating'),
+    'added_at': attrgetter('_added_at_ts')
+}
+
+def _synchronized(method):
+    """Run a mutating engine method under the engine's lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class PlaylistEngine:
     """
     Complete playlist management system using custom DSA implementations
     Time and space complexity annotations provided for all methods
+    
+    Mutators serialize on an internal lock and swap in a new playlist list
+    instead of reordering it in place, so readers such as get_songs() and
+    export_snapshot() can run without locking
     """
     
     def __init__(self):
         # Core data structures
-        self.playlist = DoublyLinkedList()  # Main playlist
-        self.playback_history = Stack()  # Track played songs for undo
-        self.artist_blocklist = HashSet()  # Blocked artists
-        self.song_lookup = HashMap()  # title -> song mapping
-        self.id_lookup = HashMap()  # id -> song mapping
-        self.rating_tree = BinarySearchTree()  # Songs by rating
-        
-        # Duration tracking heaps
-        self.min_duration_heap = MinHeap()  # For shortest songs
-        self.max_duration_heap = MaxHeap()  # For longest songs
+        self.playlist = []  # Main playlist, in play order
+        self.playback_history = deque()  # Stack of played songs for undo
+        self.artist_blocklist = set()  # Blocked artists
+        self.song_lookup = {}  # title -> song mapping
+        self.id_lookup = {}  # id -> song mapping
+        self.rating_index = RatingIndex()  # Songs by rating
+        
+        # Duration tracking: multiset of durations plus cached extremes
+        self._dur_counter = Counter()  # duration -> number of songs
+        self._min_dur = None  # For shortest songs
+        self._max_dur = None  # For longest songs
         
         # Statistics
         self.total_duration = 0
         self.song_count = 0
         
-        # Performance tracking
-        self.operation_times = {}
+        # Performance tracking: running totals per operation
+        self._op_sum_ns = {}
+        self._op_count = {}
+        
+        # Last export_snapshot result, cleared by every mutation
+        self._snapshot_cache = None
+        
+        # Criteria the playlist is currently sorted by; cleared by any change that
+        # can break the order (deletions keep the remaining songs in order)
+        self._last_sort = None
+        
+        # Serializes mutators; reentrant because undo_last_play calls add_song
+        self._lock = threading.RLock()
     
     def _time_operation(self, operation_name, func, *args, **kwargs):
         """Helper to time operations for performance analysis"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
+        elapsed_ns = time.perf_counter_ns() - start_ns
         
-        if operation_name not in self.operation_times:
-            self.operation_times[operation_name] = []
-        self.operation_times[operation_name].append(end_time - start_time)
+        with self._lock:
+            self._op_sum_ns[operation_name] = self._op_sum_ns.get(operation_name, 0) + elapsed_ns
+            self._op_count[operation_name] = self._op_count.get(operation_name, 0) + 1
+            self._snapshot_cache = None
         
         return result
     
+    def get_songs(self):
+        """
+        Current playlist order as a list
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        return self.playlist
+    
+    @_synchronized
     def add_song(self, title, artist, duration, rating=0):
         """
         Add song to playlist with comprehensive data structure updates
-        Time Complexity: O(log n) due to heap operations and BST insertion
+        Time Complexity: O(1) average
         Space Complexity: O(1) additional space
         """
         # Check artist blocklist first
-        if self.artist_blocklist.contains(artist.lower()):
+        if artist.lower() in self.artist_blocklist:
             return False, f"Artist '{artist}' is blocked"
         
         # Create new song
         song = Song(title, artist, duration, rating)
         
-        # Add to main playlist (doubly linked list)
-        self.playlist.add_song(song)
+        # Add to main playlist
+        self.playlist.append(song)
+        self._last_sort = None
         
         # Update lookup structures
-        self.song_lookup.put(title.lower(), song)
-        self.id_lookup.put(song.id, song)
+        self.song_lookup[song._title_lc] = song
+        self.id_lookup[song.id] = song
         
-        # Add to rating tree if rated
+        # Add to rating index if rated
         if rating > 0:
-            self.rating_tree.insert_song(song, rating)
+            self.rating_index.insert_song(song, rating)
         
-        # Update duration heaps
-        self.min_duration_heap.insert(duration)
-        self.max_duration_heap.insert(duration)
+        # Update duration tracking
+        self._dur_counter[duration] += 1
+        if self._min_dur is None or duration < self._min_dur:
+            self._min_dur = duration
+        if self._max_dur is None or duration > self._max_dur:
+            self._max_dur = duration
         
         # Update statistics
         self.total_duration += duration
         self.song_count += 1
         
+        self._snapshot_cache = None
         return True, f"Added '{title}' by {artist}"
     
+    @_synchronized
     def delete_song(self, index):
         """
         Delete song by playlist index
-        Time Complexity: O(n) due to linked list traversal
-        Space Complexity: O(1)
+        Time Complexity: O(n) to copy the list
+        Space Complexity: O(n)
         """
-        if index < 0 or index >= self.playlist.size:
+        if index < 0 or index >= len(self.playlist):
             return False, "Invalid index"
         
-        # Get song before deletion
-        songs = self.playlist.to_list()
-        if index >= len(songs):
-            return False, "Index out of range"
-        
-        song = songs[index]
-        
         # Remove from all data structures
-        self.playlist.delete_song(index)
-        self.song_lookup.delete(song.title.lower())
-        self.id_lookup.delete(song.id)
-        self.rating_tree.delete_song(song.id)
+        playlist = self.playlist
+        song = playlist[index]
+        self.playlist = playlist[:index] + playlist[index + 1:]
+        self._unindex_song(song)
+        self._remove_duration(song.duration)
+        
+        self._snapshot_cache = None
+        return True, f"Deleted '{song.title}'"
+    
+    def _unindex_song(self, song):
+        """Drop a song removed from the playlist from lookups and statistics"""
+        self.song_lookup.pop(song._title_lc, None)
+        del self.id_lookup[song.id]
+        self.rating_index.delete_song(song.id)
         
-        # Update statistics
         self.total_duration -= song.duration
         self.song_count -= 1
-        
-        # Note: Heap removal is complex, we rebuild for simplicity
-        self._rebuild_heaps()
-        
-        return True, f"Deleted '{song.title}'"
     
+    @_synchronized
     def move_song(self, from_index, to_index):
         """
         Move song within playlist
-        Time Complexity: O(n) due to linked list operations
-        Space Complexity: O(1)
+        Time Complexity: O(n) to copy the list
+        Space Complexity: O(n)
         """
-        success = self.playlist.move_song(from_index, to_index)
-        if success:
-            return True, f"Moved song from position {from_index} to {to_index}"
-        else:
+        size = len(self.playlist)
+        if (from_index < 0 or from_index >= size or 
+            to_index < 0 or to_index >= size or 
+            from_index == to_index):
             return False, "Invalid move operation"
+        
+        songs = list(self.playlist)
+        songs.insert(to_index, songs.pop(from_index))
+        self.playlist = songs
+        self._last_sort = None
+        self._snapshot_cache = None
+        return True, f"Moved song from position {from_index} to {to_index}"
     
+    @_synchronized
     def reverse_playlist(self):
         """
         Reverse entire playlist order
-        Time Complexity: O(n) - single pass through linked list
-        Space Complexity: O(1) - in-place reversal
+        Time Complexity: O(n) - single reversed copy
+        Space Complexity: O(n) - new list swapped in
         """
-        self.playlist.reverse_playlist()
+        self.playlist = self.playlist[::-1]
+        self._last_sort = None
+        self._snapshot_cache = None
         return True, "Playlist reversed"
     
+    @_synchronized
     def play_song(self, index):
         """
         Simulate playing a song and add to history
-        Time Complexity: O(n) for index lookup, O(1) for stack push
+        Time Complexity: O(1) for index lookup and stack push
         Space Complexity: O(1)
         """
-        songs = self.playlist.to_list()
-        if index < 0 or index >= len(songs):
+        if index < 0 or index >= len(self.playlist):
             return False, "Invalid song index"
         
-        song = songs[index]
+        song = self.playlist[index]
         
         # Add to playback history
-        self.playback_history.push(song)
+        self.playback_history.append(song)
         song.play_count += 1
         
+        self._snapshot_cache = None
         return True, f"Now playing: {song.title} by {song.artist}"
     
+    @_synchronized
     def undo_last_play(self):
         """
         Undo last played song - re-add to playlist if not already there
         Time Complexity: O(1) for stack pop, O(log n) for potential re-add
         Space Complexity: O(1)
         """
-        if self.playback_history.is_empty():
+        if not self.playback_history:
             return False, "No songs in playback history"
         
         last_song = self.playback_history.pop()
+        self._snapshot_cache = None
         
         # Check if song still exists in playlist
-        if not self.id_lookup.get(last_song.id):
+        if last_song.id not in self.id_lookup:
             # Re-add to playlist
             self.add_song(last_song.title, last_song.artist, 
                          last_song.duration, last_song.rating)
@@ -172,36 +236,41 @@ class PlaylistEngine:
         else:
             return True, f"Undid play of '{last_song.title}'"
     
+    @_synchronized
     def block_artist(self, artist):
         """
-        Add artist to blocklist
-        Time Complexity: O(1) average for HashSet add
-        Space Complexity: O(1)
+        Add artist to blocklist and drop their songs in a single pass
+        Time Complexity: O(n) single filter pass
+        Space Complexity: O(n) for the filtered playlist
         """
-        self.artist_blocklist.add(artist.lower())
+        lowered = sys.intern(artist.lower())
+        self.artist_blocklist.add(lowered)
         
         # Remove any existing songs by this artist
-        songs_to_remove = []
-        current_songs = self.playlist.to_list()
-        
-        for i, song in enumerate(current_songs):
-            if song.artist.lower() == artist.lower():
-                songs_to_remove.append(i)
-        
-        # Remove in reverse order to maintain indices
-        for i in reversed(songs_to_remove):
-            self.delete_song(i)
-        
-        return True, f"Blocked artist '{artist}' and removed {len(songs_to_remove)} songs"
+        keep, removed = [], []
+        for song in self.playlist:
+            (removed if song._artist_lc == lowered else keep).append(song)
+        
+        if removed:
+            self.playlist = keep
+            for song in removed:
+                self._unindex_song(song)
+                self._remove_duration(song.duration)
+        
+        self._snapshot_cache = None
+        return True, f"Blocked artist '{artist}' and removed {len(removed)} songs"
     
+    @_synchronized
     def unblock_artist(self, artist):
         """
         Remove artist from blocklist
-        Time Complexity: O(1) average for HashSet remove
+        Time Complexity: O(1) average for set remove
         Space Complexity: O(1)
         """
-        success = self.artist_blocklist.remove(artist.lower())
-        if success:
+        lowered = artist.lower()
+        if lowered in self.artist_blocklist:
+            self.artist_blocklist.remove(lowered)
+            self._snapshot_cache = None
             return True, f"Unblocked artist '{artist}'"
         else:
             return False, f"Artist '{artist}' was not blocked"
@@ -209,7 +278,7 @@ class PlaylistEngine:
     def search_by_title(self, title):
         """
         Instant song lookup by title
-        Time Complexity: O(1) average for HashMap lookup
+        Time Complexity: O(1) average for dict lookup
         Space Complexity: O(1)
         """
         song = self.song_lookup.get(title.lower())
@@ -220,17 +289,18 @@ class PlaylistEngine:
     
     def search_by_rating(self, rating):
         """
-        Find songs by rating using BST
-        Time Complexity: O(log n) for BST search
+        Find songs by rating using the rating index
+        Time Complexity: O(k) to copy the k matching songs
         Space Complexity: O(k) where k is number of songs with rating
         """
-        songs = self.rating_tree.search_by_rating(rating)
+        songs = self.rating_index.search_by_rating(rating)
         return songs
     
+    @_synchronized
     def rate_song(self, song_id, rating):
         """
         Rate a song (1-5 stars)
-        Time Complexity: O(log n) for BST operations
+        Time Complexity: O(1) for rating index updates
         Space Complexity: O(1)
         """
         if rating < 1 or rating > 5:
@@ -242,17 +312,19 @@ class PlaylistEngine:
         
         # Remove from old rating if exists
         if song.rating > 0:
-            self.rating_tree.delete_song(song_id)
+            self.rating_index.delete_song(song_id)
         
         # Add to new rating
-        self.rating_tree.insert_song(song, rating)
+        self.rating_index.insert_song(song, rating)
+        self._last_sort = None
         
+        self._snapshot_cache = None
         return True, f"Rated '{song.title}' {rating} stars"
     
     def get_duration_stats(self):
         """
-        Get playlist duration statistics using heaps
-        Time Complexity: O(1) for heap peek operations
+        Get playlist duration statistics from maintained counters
+        Time Complexity: O(1) attribute reads
         Space Complexity: O(1)
         """
         if self.song_count == 0:
@@ -263,8 +335,8 @@ class PlaylistEngine:
                 'average_duration': 0
             }
         
-        shortest = self.min_duration_heap.peek()
-        longest = self.max_duration_heap.peek()
+        shortest = self._min_dur
+        longest = self._max_dur
         average = self.total_duration / self.song_count
         
         return {
@@ -274,153 +346,93 @@ class PlaylistEngine:
             'average_duration': round(average, 2)
         }
     
-    def sort_playlist(self, criteria='title', algorithm='merge'):
+    @_synchronized
+    def sort_playlist(self, criteria='title', algorithm='timsort'):
         """
-        Sort playlist by various criteria using different algorithms
-        Time Complexity: O(n log n) for merge/quick sort
-        Space Complexity: O(n) for merge sort, O(log n) for quick sort
+        Sort playlist by various criteria using the built-in Timsort
+        The algorithm argument is accepted for form compatibility and ignored
+        Time Complexity: O(n log n), O(n) on already sorted runs
+        Space Complexity: O(n)
         """
-        songs = self.playlist.to_list()
+        songs = self.playlist
         
         if not songs:
             return False, "Playlist is empty"
         
-        # Define sort key functions
-        sort_keys = {
-            'title': lambda s: s.title.lower(),
-            'artist': lambda s: s.artist.lower(),
-            'duration': lambda s: s.duration,
-            'rating': lambda s: s.rating,
-            'added_at': lambda s: s.added_at
-        }
-        
-        if criteria not in sort_keys:
+        if criteria not in SORT_KEYS:
             return False, "Invalid sort criteria"
         
-        start_time = time.time()
-        
-        if algorithm == 'merge':
-            sorted_songs = self._merge_sort(songs, sort_keys[criteria])
-        elif algorithm == 'quick':
-            sorted_songs = songs.copy()
-            self._quick_sort(sorted_songs, 0, len(sorted_songs) - 1, sort_keys[criteria])
-        else:
-            return False, "Invalid sort algorithm"
+        if self._last_sort == criteria:
+            return True, f"Playlist already sorted by {criteria}"
         
-        sort_time = time.time() - start_time
+        start_time = time.perf_counter()
+        sorted_songs = sorted(songs, key=SORT_KEYS[criteria])
+        sort_time = time.perf_counter() - start_time
         
-        # Rebuild playlist with sorted songs
-        self.playlist = DoublyLinkedList()
-        for song in sorted_songs:
-            self.playlist.add_song(song)
+        self.playlist = sorted_songs
+        self._last_sort = criteria
         
-        return True, f"Sorted by {criteria} using {algorithm} sort in {sort_time:.4f}s"
+        self._snapshot_cache = None
+        return True, f"Sorted by {criteria} using Timsort in {sort_time:.4f}s"
     
-    def _merge_sort(self, arr, key_func):
+    def _remove_duration(self, duration):
         """
-        Merge sort implementation
-        Time Complexity: O(n log n)
-        Space Complexity: O(n)
+        Remove one duration, recomputing an extreme only when its last song leaves
+        Time Complexity: O(1), or O(d) for d distinct durations on recompute
         """
-        if len(arr) <= 1:
-            return arr
-        
-        mid = len(arr) // 2
-        left = self._merge_sort(arr[:mid], key_func)
-        right = self._merge_sort(arr[mid:], key_func)
+        counter = self._dur_counter
+        counter[duration] -= 1
+        if counter[duration]:
+            return
         
-        return self._merge(left, right, key_func)
-    
-    def _merge(self, left, right, key_func):
-        """Helper function for merge sort"""
-        result = []
-        i, j = 0, 0
-        
-        while i < len(left) and j < len(right):
-            if key_func(left[i]) <= key_func(right[j]):
-                result.append(left[i])
-                i += 1
-            else:
-                result.append(right[j])
-                j += 1
-        
-        result.extend(left[i:])
-        result.extend(right[j:])
-        return result
-    
-    def _quick_sort(self, arr, low, high, key_func):
-        """
-        Quick sort implementation
-        Time Complexity: O(n log n) average, O(n²) worst case
-        Space Complexity: O(log n)
-        """
-        if low < high:
-            pivot_index = self._partition(arr, low, high, key_func)
-            self._quick_sort(arr, low, pivot_index - 1, key_func)
-            self._quick_sort(arr, pivot_index + 1, high, key_func)
-    
-    def _partition(self, arr, low, high, key_func):
-        """Helper function for quick sort partitioning"""
-        pivot = key_func(arr[high])
-        i = low - 1
-        
-        for j in range(low, high):
-            if key_func(arr[j]) <= pivot:
-                i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-        
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        return i + 1
-    
-    def _rebuild_heaps(self):
-        """Rebuild duration heaps after song deletion"""
-        self.min_duration_heap = MinHeap()
-        self.max_duration_heap = MaxHeap()
-        
-        for song in self.playlist.to_list():
-            self.min_duration_heap.insert(song.duration)
-            self.max_duration_heap.insert(song.duration)
+        del counter[duration]
+        if duration == self._min_dur:
+            self._min_dur = min(counter, default=None)
+        if duration == self._max_dur:
+            self._max_dur = max(counter, default=None)
     
     def export_snapshot(self):
         """
         Generate live dashboard data integrating all DSA components
-        Time Complexity: O(n) for tree traversal and list operations
+        Cached until the next mutation
+        Time Complexity: O(1) when cached, O(n) for list operations otherwise
         Space Complexity: O(n) for data aggregation
         """
-        songs = self.playlist.to_list()
+        snapshot = self._snapshot_cache
+        if snapshot is not None:
+            return snapshot
+        
+        # Build under the lock so a concurrent mutation cannot leave a stale cache
+        with self._lock:
+            if self._snapshot_cache is None:
+                self._snapshot_cache = self._build_snapshot()
+            return self._snapshot_cache
+    
+    def _build_snapshot(self):
+        """Aggregate dashboard data for export_snapshot - O(n)"""
+        songs = self.playlist
         duration_stats = self.get_duration_stats()
-        rating_counts = self.rating_tree.get_all_ratings_count()
+        rating_counts = self.rating_index.get_all_ratings_count()
         
         # Top 5 longest songs
-        longest_songs = sorted(songs, key=lambda s: s.duration, reverse=True)[:5]
+        longest_songs = heapq.nlargest(5, songs, key=lambda s: s.duration)
         
-        # Most recently played (from history)
-        recent_history = []
-        temp_stack = Stack()
-        
-        # Get recent history without destroying original stack
-        while not self.playback_history.is_empty():
-            song = self.playback_history.pop()
-            recent_history.append(song)
-            temp_stack.push(song)
-        
-        # Restore original stack
-        while not temp_stack.is_empty():
-            self.playback_history.push(temp_stack.pop())
+        # Five most recently played, read from the top of the stack without popping
+        recent_history = list(islice(reversed(self.playback_history), 5))
         
         return {
             'total_songs': self.song_count,
             'total_duration': self.total_duration,
             'duration_stats': duration_stats,
             'longest_songs': [song.to_dict() for song in longest_songs],
-            'recent_history': [song.to_dict() for song in recent_history[:5]],
+            'recent_history': [song.to_dict() for song in recent_history],
             'rating_distribution': rating_counts,
-            'blocked_artists': self.artist_blocklist.to_list(),
+            'blocked_artists': list(self.artist_blocklist),
             'performance_metrics': {
                 name: {
-                    'average_time': sum(times) / len(times) if times else 0,
-                    'total_calls': len(times)
-                } for name, times in self.operation_times.items()
+                    'average_time': self._op_sum_ns[name] / count / 1e9,
+                    'total_calls': count
+                } for name, count in self._op_count.items()
             }
         }
     
@@ -431,40 +443,39 @@ class PlaylistEngine:
         """
         return {
             'data_structures': {
-                'DoublyLinkedList': {
-                    'add_song': 'O(1) time, O(1) space',
-                    'delete_song': 'O(n) time, O(1) space',
-                    'move_song': 'O(n) time, O(1) space',
-                    'reverse_playlist': 'O(n) time, O(1) space'
+                'list (playlist)': {
+                    'add_song': 'O(1) amortized time, O(1) space',
+                    'delete_song': 'O(n) time, O(n) space (copy-on-write)',
+                    'move_song': 'O(n) time, O(n) space (copy-on-write)',
+                    'reverse_playlist': 'O(n) time, O(n) space (copy-on-write)'
                 },
-                'HashSet (blocklist)': {
+                'set (blocklist)': {
                     'add': 'O(1) average time, O(1) space',
                     'contains': 'O(1) average time, O(1) space',
                     'remove': 'O(1) average time, O(1) space'
                 },
-                'HashMap (lookup)': {
-                    'put': 'O(1) average time, O(1) space',
+                'dict (lookup)': {
+                    'set item': 'O(1) average time, O(1) space',
                     'get': 'O(1) average time, O(1) space',
                     'delete': 'O(1) average time, O(1) space'
                 },
-                'BinarySearchTree (ratings)': {
-                    'insert': 'O(log n) average time, O(1) space',
-                    'search': 'O(log n) average time, O(k) space for k results',
-                    'delete': 'O(log n) average time, O(1) space'
+                'RatingIndex (ratings)': {
+                    'insert': 'O(1) time, O(1) space',
+                    'search': 'O(k) time, O(k) space for k results',
+                    'delete': 'O(1) time, O(1) space'
                 },
-                'MinHeap/MaxHeap (duration)': {
-                    'insert': 'O(log n) time, O(1) space',
-                    'extract': 'O(log n) time, O(1) space',
-                    'peek': 'O(1) time, O(1) space'
+                'Counter (duration)': {
+                    'insert': 'O(1) time, O(1) space',
+                    'remove': 'O(1) time, O(d) to recompute min/max for d distinct durations',
+                    'min/max': 'O(1) time, O(1) space'
                 },
-                'Stack (history)': {
-                    'push': 'O(1) time, O(1) space',
+                'deque (history stack)': {
+                    'append': 'O(1) time, O(1) space',
                     'pop': 'O(1) time, O(1) space',
                     'peek': 'O(1) time, O(1) space'
                 }
             },
             'sorting_algorithms': {
-                'merge_sort': 'O(n log n) time, O(n) space',
-                'quick_sort': 'O(n log n) average, O(n²) worst time, O(log n) space'
+                'timsort': 'O(n log n) worst time, O(n) on presorted input, O(n) space'
             }
         }
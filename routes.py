@@ -3,22 +3,28 @@ Flask routes for PlayWise Music Player
 Handles all web interface interactions with the playlist engine
 """
 
-from flask import render_template, request, redirect, url_for, flash, jsonify
+from flask import render_template, request, redirect, url_for, flash
 from app import app
 from playlist_engine import PlaylistEngine
 import json
+import orjson
 
 # Global playlist engine instance
 playlist_engine = PlaylistEngine()
 
+def _json_response(data):
+    """Serialize data with orjson; rating_distribution uses int keys"""
+    return app.response_class(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS),
+                              mimetype='application/json')
+
 @app.route('/')
 def index():
     """
     Main playlist view showing current songs and controls
     """
-    songs = playlist_engine.playlist.to_list()
+    songs = playlist_engine.get_songs()
     duration_stats = playlist_engine.get_duration_stats()
-    blocked_artists = playlist_engine.artist_blocklist.to_list()
+    blocked_artists = list(playlist_engine.artist_blocklist)
     
     return render_template('index.html', 
                          songs=songs,
@@ -30,6 +36,12 @@ def add_song():
     """Add new song to playlist"""
     title = request.form.get('title', '').strip()
     artist = request.form.get('artist', '').strip()
+    
+    # Reject blocked artists before any further parsing or engine work
+    if artist.lower() in playlist_engine.artist_blocklist:
+        flash(f"Artist '{artist}' is blocked", 'error')
+        return redirect(url_for('index'))
+    
     duration = request.form.get('duration', type=int)
     rating = request.form.get('rating', 0, type=int)
     
@@ -173,7 +185,7 @@ def search():
 @app.route('/rate_song', methods=['POST'])
 def rate_song():
     """Rate a song"""
-    song_id = request.form.get('song_id')
+    song_id = request.form.get('song_id', type=int)
     rating = request.form.get('rating', type=int)
     
     if not song_id or not rating:
@@ -193,7 +205,7 @@ def rate_song():
 def sort_playlist():
     """Sort playlist by specified criteria"""
     criteria = request.form.get('criteria', 'title')
-    algorithm = request.form.get('algorithm', 'merge')
+    algorithm = request.form.get('algorithm', 'timsort')
     
     success, message = playlist_engine.sort_playlist(criteria, algorithm)
     
@@ -218,13 +230,13 @@ def dashboard():
 def api_duration_stats():
     """API endpoint for duration statistics (for real-time updates)"""
     stats = playlist_engine.get_duration_stats()
-    return jsonify(stats)
+    return _json_response(stats)
 
 @app.route('/api/snapshot')
 def api_snapshot():
     """API endpoint for complete system snapshot"""
     snapshot = playlist_engine.export_snapshot()
-    return jsonify(snapshot)
+    return _json_response(snapshot)
 
 # Error handlers
 @app.errorhandler(404)